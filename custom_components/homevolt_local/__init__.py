@@ -25,6 +25,7 @@ from .const import (
     CONF_HOST,
     CONF_HOSTS,
     CONF_MAIN_HOST,
+    CONF_PREFER_MAIN_HOST,
     CONF_RESOURCE,
     CONF_RESOURCES,
     DEFAULT_CONNECT_TIMEOUT,
@@ -155,6 +156,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     verify_ssl = entry.data.get(CONF_VERIFY_SSL, True)
     scan_interval = entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
     read_timeout = entry.data.get(CONF_TIMEOUT, DEFAULT_READ_TIMEOUT)
+    prefer_main_host = entry.data.get(CONF_PREFER_MAIN_HOST, False)
     # Get stored ecu_id for stable device identification
     ecu_id = entry.data.get("ecu_id")
 
@@ -171,6 +173,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         verify_ssl=verify_ssl,
         update_interval=timedelta(seconds=scan_interval),
         read_timeout=read_timeout,
+        prefer_main_host=prefer_main_host,
     )
 
     await coordinator.async_config_entry_first_refresh()
@@ -27,6 +27,7 @@ from .const import (
     CONF_HOSTS,
     CONF_MAIN_HOST,
     CONF_MDNS_ID,
+    CONF_PREFER_MAIN_HOST,
     CONF_RESOURCES,
     DEFAULT_READ_TIMEOUT,
     DEFAULT_SCAN_INTERVAL,
@@ -678,6 +679,7 @@ class HomevoltOptionsFlowHandler(config_entries.OptionsFlow):
                         CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
                     ),
                     CONF_TIMEOUT: user_input.get(CONF_TIMEOUT, DEFAULT_READ_TIMEOUT),
+                    CONF_PREFER_MAIN_HOST: user_input.get(CONF_PREFER_MAIN_HOST, False),
                 }
 
                 # Update config entry data
@@ -714,6 +716,9 @@ class HomevoltOptionsFlowHandler(config_entries.OptionsFlow):
             CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
         )
         current_timeout = self.config_entry.data.get(CONF_TIMEOUT, DEFAULT_READ_TIMEOUT)
+        current_prefer_main_host = self.config_entry.data.get(
+            CONF_PREFER_MAIN_HOST, False
+        )
 
         options_schema = vol.Schema(
             {
@@ -722,6 +727,9 @@ class HomevoltOptionsFlowHandler(config_entries.OptionsFlow):
                 vol.Optional(CONF_VERIFY_SSL, default=current_verify_ssl): bool,
                 vol.Optional(CONF_SCAN_INTERVAL, default=current_scan_interval): int,
                 vol.Optional(CONF_TIMEOUT, default=current_timeout): int,
+                vol.Optional(
+                    CONF_PREFER_MAIN_HOST, default=current_prefer_main_host
+                ): bool,
             }
         )
 
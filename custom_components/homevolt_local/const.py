@@ -9,6 +9,8 @@ CONF_HOSTS = "hosts"
 CONF_MAIN_HOST = "main_host"
 CONF_RESOURCES = "resources"
 CONF_ADD_ANOTHER = "add_another"
+# Poll only the main host on most cycles (multi-host setups)
+CONF_PREFER_MAIN_HOST = "prefer_main_host"
 DEFAULT_SCAN_INTERVAL = 30
 # Separate timeouts for better handling of poor connections
 # Connect timeout: how long to wait to establish connection (fail fast if unreachable)
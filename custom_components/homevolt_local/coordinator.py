@@ -15,6 +15,7 @@ from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
+from homeassistant.util.json import json_loads
 
 from .const import (
     ATTR_ECU_ID,
@@ -37,6 +38,10 @@ RETRY_COUNT = 3
 RETRY_BACKOFF_FACTOR = 2.0  # seconds: 2, 4, 8...
 RETRY_STATUS_CODES = {502, 503, 504}
 
+# When prefer_main_host is enabled, still poll the secondary hosts every
+# Nth update so failover data stays warm
+SECONDARY_PROBE_INTERVAL = 10
+
 
 class HomevoltDataUpdateCoordinator(DataUpdateCoordinator[HomevoltData]):
     """Class to manage fetching Homevolt data."""
@@ -55,6 +60,7 @@ class HomevoltDataUpdateCoordinator(DataUpdateCoordinator[HomevoltData]):
         verify_ssl: bool,
         update_interval: timedelta,
         read_timeout: int = DEFAULT_READ_TIMEOUT,
+        prefer_main_host: bool = False,
     ) -> None:
         """Initialize."""
         self.entry_id = entry_id
@@ -79,6 +85,22 @@ class HomevoltDataUpdateCoordinator(DataUpdateCoordinator[HomevoltData]):
         # Store hass reference for session access
         self._hass = hass
 
+        # Resolve the shared aiohttp session once; async_get_clientsession
+        # returns the same session for the coordinator's lifetime anyway,
+        # so there is no need to look it up on every request
+        self._session = async_get_clientsession(hass, verify_ssl=verify_ssl)
+
+        # When enabled, only the main host is polled on most cycles and the
+        # secondary hosts are probed every SECONDARY_PROBE_INTERVAL updates.
+        # Off by default: skipping secondaries also skips their extra EMS
+        # devices, so this is a deliberate trade-off for large setups.
+        self._prefer_main_host = prefer_main_host
+
+        # Latest fan-out results for the non-main hosts; reused between
+        # probe cycles so their devices survive (as stale data) when the
+        # fast path skips them
+        self._secondary_results: list[tuple[str, dict[str, Any]]] = []
+
         # Schedule fetch counter - only fetch every Nth EMS update to reduce load
         self._update_count = 0
         self._schedule_fetch_interval = SCHEDULE_FETCH_INTERVAL
@@ -94,7 +116,7 @@ class HomevoltDataUpdateCoordinator(DataUpdateCoordinator[HomevoltData]):
 
     def _get_session(self) -> aiohttp.ClientSession:
         """Get the aiohttp session from Home Assistant."""
-        return async_get_clientsession(self._hass, verify_ssl=self.verify_ssl)
+        return self._session
 
     @property
     def _auth(self) -> aiohttp.BasicAuth | None:
@@ -139,7 +161,8 @@ class HomevoltDataUpdateCoordinator(DataUpdateCoordinator[HomevoltData]):
                         raise UpdateFailed(
                             f"Error communicating with API: {resp.status}"
                         )
-                    return await resp.json()
+                    # Parse with HA's orjson-backed loader instead of stdlib json
+                    return await resp.json(loads=json_loads)
             except (TimeoutError, aiohttp.ClientError) as err:
                 last_error = err
                 if attempt < RETRY_COUNT:
@@ -309,15 +332,16 @@ class HomevoltDataUpdateCoordinator(DataUpdateCoordinator[HomevoltData]):
         if not self.resources:
             raise UpdateFailed("No resources configured")
 
-        # Fetch EMS data from all hosts
-        valid_results = await self._fetch_all_ems_data()
+        # Fetch EMS data from all hosts and the schedule data (which may
+        # use its cache) concurrently instead of back to back
+        self._update_count += 1
+        valid_results, schedule_data = await asyncio.gather(
+            self._fetch_all_ems_data(),
+            self._get_schedule_data_with_cache(),
+        )
         if not valid_results:
             raise UpdateFailed("Failed to fetch data from any resource")
 
-        # Get schedule data (may use cache)
-        self._update_count += 1
-        schedule_data = await self._get_schedule_data_with_cache()
-
         # Find main system data and merge
         verbose_log = self._should_log_verbose(len(valid_results))
         main_data, main_data_host = self._find_main_data(valid_results, verbose_log)
@@ -343,18 +367,59 @@ class HomevoltDataUpdateCoordinator(DataUpdateCoordinator[HomevoltData]):
         if not self.resources:
             return []
 
-        # Fetch all hosts in parallel for better performance
-        tasks = [self._fetch_resource_data(resource) for resource in self.resources]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # Optional fast path: poll only the main host while it is healthy,
+        # reusing the secondary hosts' results from the last full fan-out.
+        # The first refresh and every probe cycle fan out to all hosts so
+        # the secondary devices exist and merely go stale between probes.
+        if (
+            self._prefer_main_host
+            and len(self.resources) > 1
+            and self._update_count > 1
+            and self._update_count % SECONDARY_PROBE_INTERVAL != 0
+        ):
+            main_index = (
+                self.hosts.index(self.main_host) if self.main_host in self.hosts else 0
+            )
+            try:
+                result = await self._fetch_resource_data(self.resources[main_index])
+            except UpdateFailed as err:
+                self.logger.warning(
+                    "Main host %s failed, falling back to all hosts: %s",
+                    self.hosts[main_index],
+                    err,
+                )
+            else:
+                return [(self.hosts[main_index], result), *self._secondary_results]
+
+        # Fetch all hosts in parallel for better performance. A TaskGroup
+        # gives deterministic cleanup on shutdown (no dangling tasks);
+        # per-host errors are caught inside each task so one failing host
+        # never cancels the others.
+        results: list[dict[str, Any] | None] = [None] * len(self.resources)
 
-        valid_results: list[tuple[str, dict[str, Any]]] = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
+        async def fetch(index: int) -> None:
+            try:
+                results[index] = await self._fetch_resource_data(self.resources[index])
+            except Exception as err:  # logged and skipped; one bad host is fine
                 self.logger.warning(
-                    "Error fetching data from %s: %s", self.resources[i], result
+                    "Error fetching data from %s: %s", self.resources[index], err
                 )
-            elif isinstance(result, dict):
-                valid_results.append((self.hosts[i], result))
+
+        async with asyncio.TaskGroup() as tg:
+            for index in range(len(self.resources)):
+                tg.create_task(fetch(index))
+
+        valid_results = [
+            (self.hosts[index], result)
+            for index, result in enumerate(results)
+            if result is not None
+        ]
+
+        # Remember the non-main hosts' results for the fast path to reuse
+        if self._prefer_main_host:
+            self._secondary_results = [
+                (host, data) for host, data in valid_results if host != self.main_host
+            ]
 
         return valid_results
 
@@ -488,6 +553,20 @@ class HomevoltDataUpdateCoordinator(DataUpdateCoordinator[HomevoltData]):
         all_ems = self._deduplicate_ems_list(merged_data.get(ATTR_EMS, []))
         all_sensors = self._deduplicate_sensor_list(merged_data.get(ATTR_SENSORS, []))
 
+        # Track what is already merged with sets so each duplicate check is
+        # a hash lookup instead of a scan over the accumulated lists
+        seen_ecu_ids: set[Any] = {
+            ems[ATTR_ECU_ID] for ems in all_ems if ems.get(ATTR_ECU_ID) is not None
+        }
+        seen_sensor_keys: set[tuple[Any, Any]] = {
+            (sensor.get(ATTR_EUID), sensor.get(ATTR_TYPE))
+            for sensor in all_sensors
+            if sensor.get(ATTR_EUID) and sensor.get(ATTR_TYPE)
+        }
+        seen_euids: set[Any] = {
+            sensor[ATTR_EUID] for sensor in all_sensors if sensor.get(ATTR_EUID)
+        }
+
         if verbose_log:
             self.logger.debug(
                 "Merge starting: skip_host=%s, initial ems=%d, initial sensors=%d",
@@ -517,7 +596,8 @@ class HomevoltDataUpdateCoordinator(DataUpdateCoordinator[HomevoltData]):
                     # Check if this EMS device is already in the list (based on ecu_id)
                     if ATTR_ECU_ID in ems:
                         ecu_id = ems[ATTR_ECU_ID]
-                        if not any(e.get(ATTR_ECU_ID) == ecu_id for e in all_ems):
+                        if ecu_id not in seen_ecu_ids:
+                            seen_ecu_ids.add(ecu_id)
                             all_ems.append(ems)
                     else:
                         # If no ecu_id, just add it
@@ -533,14 +613,15 @@ class HomevoltDataUpdateCoordinator(DataUpdateCoordinator[HomevoltData]):
                     sensor_type = sensor.get(ATTR_TYPE)
                     if euid and sensor_type:
                         # Check for duplicate by both euid and type
-                        if not any(
-                            s.get(ATTR_EUID) == euid and s.get(ATTR_TYPE) == sensor_type
-                            for s in all_sensors
-                        ):
+                        key = (euid, sensor_type)
+                        if key not in seen_sensor_keys:
+                            seen_sensor_keys.add(key)
+                            seen_euids.add(euid)
                             all_sensors.append(sensor)
                     elif euid:
                         # Fallback: if no type, just check euid
-                        if not any(s.get(ATTR_EUID) == euid for s in all_sensors):
+                        if euid not in seen_euids:
+                            seen_euids.add(euid)
                             all_sensors.append(sensor)
                     else:
                         # If no euid, just add it
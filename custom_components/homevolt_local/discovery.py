@@ -9,9 +9,12 @@ from __future__ import annotations
 
 import re
 
-from homeassistant.helpers.device_registry import format_mac
 from homeassistant.helpers.service_info.zeroconf import ZeroconfServiceInfo
 
+# Strip the common MAC separators in one C-level pass
+_MAC_SEPARATORS = str.maketrans("", "", ":-.")
+_HEX_DIGITS = frozenset("0123456789abcdef")
+
 
 def extract_hostname(discovery_info: ZeroconfServiceInfo | dict) -> str | None:
     """Return a sensible hostname string for the discovery info.
@@ -64,21 +67,24 @@ def extract_port(discovery_info: ZeroconfServiceInfo | dict) -> int | None:
 
 def build_base_url(host: str, port: int | None) -> str:
     """Construct a base http:// URL including port when non-standard."""
-    if port and port != 80:
-        return f"http://{host}:{port}"
-    return f"http://{host}"
+    # Default port (None/80) is the overwhelmingly common case
+    if not port or port == 80:
+        return f"http://{host}"
+    return f"http://{host}:{port}"
 
 
-# Match exactly 12 hex characters (MAC address without separators)
-MDNS_ID_RE = re.compile(r"([0-9a-f]{12})", re.IGNORECASE)
+# Match exactly 12 hex characters (MAC address without separators).
+# The hostname is lowercased before matching, so the pattern does not
+# need re.IGNORECASE and the match can be returned as-is.
+MDNS_ID_RE = re.compile(r"([0-9a-f]{12})")
 
 
 def extract_mdns_id(discovery_info: ZeroconfServiceInfo | dict) -> str | None:
     """Try to extract an mdns id or device id from the hostname/instance name."""
-    hostname = extract_hostname(discovery_info) or ""
+    hostname = (extract_hostname(discovery_info) or "").lower()
     m = MDNS_ID_RE.search(hostname)
     if m:
-        return m.group(1).lower()
+        return m.group(1)
     return None
 
 
@@ -101,7 +107,10 @@ def extract_mac(discovery_info: ZeroconfServiceInfo | dict) -> str | None:
         if isinstance(device_raw, (bytes, bytearray))
         else str(device_raw)
     )
-    try:
-        return format_mac(device_id)
-    except (ValueError, TypeError):
-        return None
+    # Normalize to the canonical aa:bb:cc:dd:ee:ff form without the regex
+    # pass format_mac would do; non-MAC values pass through unchanged,
+    # matching format_mac's behavior
+    stripped = device_id.lower().translate(_MAC_SEPARATORS)
+    if len(stripped) == 12 and _HEX_DIGITS.issuperset(stripped):
+        return ":".join(stripped[i : i + 2] for i in range(0, 12, 2))
+    return device_id
@@ -25,7 +25,7 @@ from .const import (
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class ScheduleEntry:
     """Model for a single schedule entry."""
 
@@ -39,7 +39,7 @@ class ScheduleEntry:
     max_charge: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class EmsInfo:
     """Model for EMS information."""
 
@@ -59,7 +59,7 @@ class EmsInfo:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class BmsInfo:
     """Model for BMS information."""
 
@@ -79,7 +79,7 @@ class BmsInfo:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class InvInfo:
     """Model for inverter information."""
 
@@ -95,7 +95,7 @@ class InvInfo:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class EmsConfig:
     """Model for EMS configuration."""
 
@@ -113,7 +113,7 @@ class EmsConfig:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class InvConfig:
     """Model for inverter configuration."""
 
@@ -127,7 +127,7 @@ class InvConfig:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class EmsControl:
     """Model for EMS control."""
 
@@ -167,7 +167,7 @@ class EmsControl:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class EmsData:
     """Model for EMS data."""
 
@@ -221,7 +221,7 @@ class EmsData:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class BmsData:
     """Model for BMS data."""
 
@@ -251,7 +251,7 @@ class BmsData:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class EmsPrediction:
     """Model for EMS prediction."""
 
@@ -279,7 +279,7 @@ class EmsPrediction:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class EmsVoltage:
     """Model for EMS voltage."""
 
@@ -303,7 +303,7 @@ class EmsVoltage:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class EmsCurrent:
     """Model for EMS current."""
 
@@ -321,7 +321,7 @@ class EmsCurrent:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class EmsAggregate:
     """Model for EMS aggregate."""
 
@@ -337,7 +337,7 @@ class EmsAggregate:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class PhaseData:
     """Model for phase data."""
 
@@ -357,7 +357,7 @@ class PhaseData:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class SensorData:
     """Model for sensor data."""
 
@@ -397,7 +397,7 @@ class SensorData:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class EmsDevice:
     """Model for an EMS device."""
 
@@ -594,7 +594,7 @@ class EmsDevice:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class HomevoltData:
     """Model for Homevolt data."""
 
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import logging
 from collections.abc import Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from datetime import datetime
 from typing import Any
 
@@ -222,6 +222,15 @@ def get_current_schedule(data: HomevoltData) -> str:
     return "No active schedule"
 
 
+def _fields_dict(obj: Any) -> dict[str, Any]:
+    """Return a shallow dict of a dataclass instance's fields.
+
+    The models are slotted dataclasses, so they have no __dict__ to
+    expose as state attributes.
+    """
+    return {field.name: getattr(obj, field.name) for field in fields(obj)}
+
+
 @dataclass(frozen=True, kw_only=True)
 class HomevoltSensorEntityDescription(SensorEntityDescription):
     """Describes Homevolt sensor entity."""
@@ -247,9 +256,9 @@ SENSOR_DESCRIPTIONS: tuple[HomevoltSensorEntityDescription, ...] = (
         icon="mdi:state-machine",
         value_fn=lambda data: data.aggregated.ems_data.state_str,
         attrs_fn=lambda data: {
-            ATTR_EMS: [ems.__dict__ for ems in data.ems] if data.ems else [],
-            ATTR_AGGREGATED: data.aggregated.__dict__ if data.aggregated else {},
-            ATTR_SENSORS: [sensor.__dict__ for sensor in data.sensors]
+            ATTR_EMS: [_fields_dict(ems) for ems in data.ems] if data.ems else [],
+            ATTR_AGGREGATED: _fields_dict(data.aggregated) if data.aggregated else {},
+            ATTR_SENSORS: [_fields_dict(sensor) for sensor in data.sensors]
             if data.sensors
             else [],
         },
@@ -260,7 +269,7 @@ SENSOR_DESCRIPTIONS: tuple[HomevoltSensorEntityDescription, ...] = (
         icon="mdi:calendar-clock",
         value_fn=get_current_schedule,
         attrs_fn=lambda data: {
-            "schedules": [schedule.__dict__ for schedule in data.schedules],
+            "schedules": [_fields_dict(schedule) for schedule in data.schedules],
             "schedule_count": data.schedule_count,
             "schedule_current_id": data.schedule_current_id,
         },
@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
+import copy
+import importlib
 import json
 from collections.abc import Generator
+from functools import cache
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -15,13 +19,16 @@ from homeassistant.const import (
     CONF_TIMEOUT,
     CONF_USERNAME,
     CONF_VERIFY_SSL,
+    Platform,
 )
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.homevolt_local.const import (
     CONF_HOSTS,
     CONF_MAIN_HOST,
+    CONF_PREFER_MAIN_HOST,
     CONF_RESOURCES,
     DEFAULT_READ_TIMEOUT,
     DEFAULT_SCAN_INTERVAL,
@@ -34,22 +41,173 @@ pytest_plugins = "pytest_homeassistant_custom_component"
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
 
 
+@cache
 def load_fixture(filename: str) -> str:
-    """Load a fixture file."""
+    """Load a fixture file (cached; strings are immutable)."""
     return (FIXTURES_DIR / filename).read_text()
 
 
-def load_json_fixture(filename: str) -> dict[str, Any]:
-    """Load a JSON fixture file."""
+class FakeResponse:
+    """Lightweight stand-in for an aiohttp response.
+
+    Acts as its own async context manager, which is all the coordinator
+    and config flow need. Much cheaper to construct than an AsyncMock
+    with manually wired __aenter__/__aexit__/json/text attributes.
+    """
+
+    def __init__(
+        self,
+        status: int = 200,
+        json_data: dict[str, Any] | Any | None = None,
+        text_data: str = "",
+    ) -> None:
+        """Initialize the fake response."""
+        self.status = status
+        self._json = json_data
+        self._text = text_data
+
+    async def __aenter__(self) -> FakeResponse:
+        """Enter the async context manager."""
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Exit the async context manager."""
+
+    async def json(self, **kwargs: Any) -> Any:
+        """Return the JSON payload (or call a payload factory)."""
+        if callable(self._json):
+            return self._json()
+        return self._json
+
+    async def text(self) -> str:
+        """Return the text payload."""
+        return self._text
+
+
+class FakeSession:
+    """Minimal aiohttp ClientSession stand-in exposing only get/post.
+
+    Unlike a bare MagicMock session, no mock children are created for
+    the many session attributes the code never touches; get/post stay
+    MagicMocks so call arguments can still be asserted.
+    """
+
+    def __init__(
+        self,
+        get_response: FakeResponse | None = None,
+        post_response: FakeResponse | None = None,
+    ) -> None:
+        """Initialize the fake session."""
+        self.get = MagicMock(return_value=get_response)
+        self.post = MagicMock(return_value=post_response)
+
+
+def create_aiohttp_session_mock(
+    get_response: dict[str, Any] | None = None,
+    post_response: str = "Schedule get: 0 schedules. Current ID: ''",
+    get_json_func: Any | None = None,
+) -> FakeSession:
+    """Create a fake aiohttp ClientSession for the coordinator.
+
+    A fresh FakeSession per call is two MagicMocks, so this stays cheap
+    without sharing call history between tests.
+    """
+    # GET returns the given payload (or calls the payload factory),
+    # POST returns the schedule console output
+    return FakeSession(
+        get_response=FakeResponse(200, json_data=get_json_func or get_response or {}),
+        post_response=FakeResponse(200, text_data=post_response),
+    )
+
+
+@cache
+def _load_json_fixture_cached(filename: str) -> dict[str, Any]:
+    """Parse a JSON fixture file once per session."""
     return json.loads(load_fixture(filename))
 
 
+def load_json_fixture(filename: str) -> dict[str, Any]:
+    """Load a JSON fixture file.
+
+    Returns a deep copy of the cached parse so tests can mutate their
+    payload without leaking changes into other tests.
+    """
+    return copy.deepcopy(_load_json_fixture_cached(filename))
+
+
 @pytest.fixture(autouse=True)
 def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
     """Auto enable custom integrations for all tests."""
     return
 
 
+@pytest.fixture(autouse=True, scope="session")
+def preload_integration_modules() -> None:
+    """Import the integration modules once for the whole session.
+
+    Home Assistant resolves the integration per hass instance (that cache
+    lives in hass.data), but the Python modules themselves stay cached in
+    sys.modules, so paying the import cost up front keeps it out of the
+    first test that happens to load each platform.
+    """
+    importlib.import_module("custom_components.homevolt_local.config_flow")
+    importlib.import_module("custom_components.homevolt_local.coordinator")
+    importlib.import_module("custom_components.homevolt_local.sensor")
+
+
+# Skeleton for get_mock_api_response, built once at import; each call
+# deep-copies it and patches in the overrides instead of rebuilding the
+# whole literal
+_RESPONSE_TEMPLATE: dict[str, Any] = {
+    "aggregated": {
+        "ems_data": {
+            "state_str": "idle",
+            "soc_avg": 50.0,
+            "power": 100.0,
+            "energy_produced": 1000.0,
+            "energy_consumed": 500.0,
+        },
+        "error_str": "",
+        "bms_data": [{"soc": 5000, "tmax": 25.0, "tmin": 20.0}],
+    },
+    "ems": [
+        {
+            "ecu_id": "test_ecu_123",
+            "ems_data": {
+                "state_str": "idle",
+                "soc_avg": 50.0,
+                "power": 100.0,
+                "energy_produced": 1000.0,
+                "energy_consumed": 500.0,
+            },
+            "error_str": "",
+            "inv_info": {"serial_number": "inv_0"},
+            "ems_info": {"fw_version": "1.0.0", "rated_capacity": 10000},
+            "bms_data": [{"soc": 5000, "tmax": 25.0, "tmin": 20.0}],
+            "bms_info": [
+                {
+                    "fw_version": "2.1.0",
+                    "serial_number": "BMS001",
+                    "rated_cap": 5000,
+                    "id": 0,
+                }
+            ],
+        }
+    ],
+    "sensors": [
+        {
+            "euid": "sensor_0",
+            "type": "grid",
+            "total_power": 200.0,
+            "energy_imported": 2000.0,
+            "energy_exported": 1000.0,
+            "available": True,
+            "node_id": 0,
+        }
+    ],
+}
+
+
 def get_mock_api_response(
     state: str = "idle",
     power: float = 100.0,
@@ -57,54 +215,34 @@ def get_mock_api_response(
     ecu_id: str = "test_ecu_123",
 ) -> dict[str, Any]:
     """Return mock API response with configurable values."""
-    return {
-        "aggregated": {
-            "ems_data": {
-                "state_str": state,
-                "soc_avg": 50.0,
-                "power": power,
-                "energy_produced": 1000.0,
-                "energy_consumed": 500.0,
-            },
-            "error_str": "",
-            "bms_data": [{"soc": soc, "tmax": 25.0, "tmin": 20.0}],
-        },
-        "ems": [
-            {
-                "ecu_id": ecu_id,
-                "ems_data": {
-                    "state_str": state,
-                    "soc_avg": 50.0,
-                    "power": power,
-                    "energy_produced": 1000.0,
-                    "energy_consumed": 500.0,
-                },
-                "error_str": "",
-                "inv_info": {"serial_number": "inv_0"},
-                "ems_info": {"fw_version": "1.0.0", "rated_capacity": 10000},
-                "bms_data": [{"soc": soc, "tmax": 25.0, "tmin": 20.0}],
-                "bms_info": [
-                    {
-                        "fw_version": "2.1.0",
-                        "serial_number": "BMS001",
-                        "rated_cap": 5000,
-                        "id": 0,
-                    }
-                ],
-            }
-        ],
-        "sensors": [
-            {
-                "euid": "sensor_0",
-                "type": "grid",
-                "total_power": 200.0,
-                "energy_imported": 2000.0,
-                "energy_exported": 1000.0,
-                "available": True,
-                "node_id": 0,
-            }
-        ],
+    response = copy.deepcopy(_RESPONSE_TEMPLATE)
+    for ems_data in (
+        response["aggregated"]["ems_data"],
+        response["ems"][0]["ems_data"],
+    ):
+        ems_data["state_str"] = state
+        ems_data["power"] = power
+    response["aggregated"]["bms_data"][0]["soc"] = soc
+    response["ems"][0]["bms_data"][0]["soc"] = soc
+    response["ems"][0]["ecu_id"] = ecu_id
+    return response
+
+
+# Shared read-only base for config entry data; entry factories copy it
+# and override only what differs instead of repeating the full literal
+_BASE_ENTRY_DATA = MappingProxyType(
+    {
+        CONF_MAIN_HOST: "http://192.168.1.100",
+        CONF_HOSTS: ["http://192.168.1.100"],
+        CONF_RESOURCES: ["http://192.168.1.100/ems.json"],
+        CONF_USERNAME: "",
+        CONF_PASSWORD: "",
+        CONF_VERIFY_SSL: False,
+        CONF_SCAN_INTERVAL: DEFAULT_SCAN_INTERVAL,
+        CONF_TIMEOUT: DEFAULT_READ_TIMEOUT,
+        "ecu_id": "test_ecu_123",
     }
+)
 
 
 @pytest.fixture
@@ -113,22 +251,36 @@ def mock_config_entry() -> MockConfigEntry:
     return MockConfigEntry(
         domain=DOMAIN,
         title="Homevolt",
-        data={
-            CONF_MAIN_HOST: "http://192.168.1.100",
-            CONF_HOSTS: ["http://192.168.1.100"],
-            CONF_RESOURCES: ["http://192.168.1.100/ems.json"],
-            CONF_USERNAME: "",
-            CONF_PASSWORD: "",
-            CONF_VERIFY_SSL: False,
-            CONF_SCAN_INTERVAL: DEFAULT_SCAN_INTERVAL,
-            CONF_TIMEOUT: DEFAULT_READ_TIMEOUT,
-            "ecu_id": "test_ecu_123",
-        },
+        data=dict(_BASE_ENTRY_DATA),
         unique_id="test_ecu_123",
         entry_id="test_entry_id",
     )
 
 
+def make_multi_host_entry(
+    entry_id: str,
+    unique_id: str | None = None,
+    prefer_main_host: bool = False,
+) -> MockConfigEntry:
+    """Return a config entry with two hosts for coordinator merge tests."""
+    return MockConfigEntry(
+        domain=DOMAIN,
+        title="Homevolt",
+        data={
+            **_BASE_ENTRY_DATA,
+            CONF_HOSTS: ["http://192.168.1.100", "http://192.168.1.101"],
+            CONF_RESOURCES: [
+                "http://192.168.1.100/ems.json",
+                "http://192.168.1.101/ems.json",
+            ],
+            CONF_PREFER_MAIN_HOST: prefer_main_host,
+            "ecu_id": "test_ecu",
+        },
+        unique_id=unique_id or entry_id,
+        entry_id=entry_id,
+    )
+
+
 @pytest.fixture
 def mock_api_response() -> dict[str, Any]:
     """Return mock API response from fixture file."""
@@ -143,66 +295,117 @@ def mock_schedule_response() -> str:
 
 @pytest.fixture
 def mock_setup_entry() -> Generator[AsyncMock]:
-    """Override async_setup_entry for config flow tests."""
-    with patch(
-        "custom_components.homevolt_local.async_setup_entry",
-        return_value=True,
-    ) as mock_setup:
+    """Override async_setup_entry for config flow tests.
+
+    Also patches async_unload_entry so config flow tests never run the
+    real setup/teardown path (coordinator + platforms), which is the
+    slowest part of each flow test.
+    """
+    with (
+        patch(
+            "custom_components.homevolt_local.async_setup_entry",
+            return_value=True,
+        ) as mock_setup,
+        patch(
+            "custom_components.homevolt_local.async_unload_entry",
+            return_value=True,
+        ),
+    ):
         yield mock_setup
 
 
 @pytest.fixture
 def mock_api_client(
     mock_api_response: dict[str, Any], mock_schedule_response: str
-) -> Generator[MagicMock]:
+) -> Generator[FakeSession]:
     """Mock aiohttp ClientSession for API calls."""
     with patch(
         "custom_components.homevolt_local.coordinator.async_get_clientsession"
     ) as mock_get_session:
-        # Create a mock session instance
-        mock_session = MagicMock()
+        # GET returns ems.json data, POST returns the schedule console output
+        mock_session = FakeSession(
+            get_response=FakeResponse(200, json_data=mock_api_response),
+            post_response=FakeResponse(200, text_data=mock_schedule_response),
+        )
         mock_get_session.return_value = mock_session
 
-        # Mock async GET response for ems.json (as async context manager)
-        mock_get_response = AsyncMock()
-        mock_get_response.status = 200
-        mock_get_response.json = AsyncMock(return_value=mock_api_response)
-        mock_get_response.__aenter__ = AsyncMock(return_value=mock_get_response)
-        mock_get_response.__aexit__ = AsyncMock(return_value=None)
-        mock_session.get = MagicMock(return_value=mock_get_response)
-
-        # Mock async POST response for console commands (schedule)
-        mock_post_response = AsyncMock()
-        mock_post_response.status = 200
-        mock_post_response.text = AsyncMock(return_value=mock_schedule_response)
-        mock_post_response.__aenter__ = AsyncMock(return_value=mock_post_response)
-        mock_post_response.__aexit__ = AsyncMock(return_value=None)
-        mock_session.post = MagicMock(return_value=mock_post_response)
+        yield mock_session
+
+
+@pytest.fixture
+def mock_error_api() -> Generator[FakeSession]:
+    """Mock aiohttp ClientSession where every API call fails."""
+    with patch(
+        "custom_components.homevolt_local.coordinator.async_get_clientsession"
+    ) as mock_get_session:
+        # Both GET (ems.json) and POST (schedule) return errors
+        mock_session = FakeSession(
+            get_response=FakeResponse(500), post_response=FakeResponse(500)
+        )
+        mock_get_session.return_value = mock_session
 
         yield mock_session
 
 
 @pytest.fixture
-def mock_config_flow_api(mock_api_response: dict[str, Any]) -> Generator[MagicMock]:
+def mock_config_flow_api(mock_api_response: dict[str, Any]) -> Generator[FakeSession]:
     """Mock aiohttp ClientSession for config flow validation."""
     with patch(
         "custom_components.homevolt_local.config_flow.async_get_clientsession"
     ) as mock_get_session:
-        # Create a mock session instance
-        mock_session = MagicMock()
+        # Successful GET response for validation
+        mock_session = FakeSession(
+            get_response=FakeResponse(200, json_data=mock_api_response)
+        )
         mock_get_session.return_value = mock_session
 
-        # Mock successful async GET response for validation (as async context manager)
-        mock_response = AsyncMock()
-        mock_response.status = 200
-        mock_response.json = AsyncMock(return_value=mock_api_response)
-        mock_response.__aenter__ = AsyncMock(return_value=mock_response)
-        mock_response.__aexit__ = AsyncMock(return_value=None)
-        mock_session.get = MagicMock(return_value=mock_response)
+        yield mock_session
+
+
+@pytest.fixture
+def mocked_coordinator_api(request: pytest.FixtureRequest) -> Generator[FakeSession]:
+    """Mock the coordinator's HTTP session with a configurable response.
+
+    Use with indirect parametrization; the parameter is a dict of
+    get_mock_api_response overrides (empty for the defaults).
+    """
+    spec: dict[str, Any] = getattr(request, "param", {})
+    with patch(
+        "custom_components.homevolt_local.coordinator.async_get_clientsession"
+    ) as mock_get_session:
+        mock_session = FakeSession(
+            get_response=FakeResponse(200, json_data=get_mock_api_response(**spec)),
+            post_response=FakeResponse(
+                200, text_data="Schedule get: 0 schedules. Current ID: ''"
+            ),
+        )
+        mock_get_session.return_value = mock_session
 
         yield mock_session
 
 
+def register_old_entities(
+    entity_registry: er.EntityRegistry,
+    config_entry: MockConfigEntry,
+    unique_ids: list[str],
+) -> None:
+    """Pre-register sensor entities with the given unique IDs.
+
+    Kept as one helper so migration tests share a single registration
+    loop. Inserting RegistryEntry rows behind the registry's back would
+    skip per-call validation, but the entity index bookkeeping is
+    private API that shifts between HA releases - not worth it for the
+    handful of entities these tests register.
+    """
+    for unique_id in unique_ids:
+        entity_registry.async_get_or_create(
+            Platform.SENSOR,
+            DOMAIN,
+            unique_id,
+            config_entry=config_entry,
+        )
+
+
 async def setup_integration(
     hass: HomeAssistant,
     config_entry: MockConfigEntry,
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from itertools import chain, repeat
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -13,11 +14,19 @@ from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.homevolt_local.const import CONF_HOST, DOMAIN
 
+from .conftest import FakeResponse, FakeSession
+
+# Form payloads shared across tests (async_configure does not mutate input)
+USER_STEP_VALID = {CONF_HOST: "192.168.1.100", CONF_PASSWORD: ""}
+USER_STEP_BAD_AUTH = {CONF_HOST: "192.168.1.100", CONF_PASSWORD: "wrong"}
+USER_STEP_INVALID_HOST = {CONF_HOST: "invalid host with spaces", CONF_PASSWORD: ""}
+ADD_HOST_DONE = {CONF_HOST: ""}
+
 
 async def test_config_flow_user_step(
     hass: HomeAssistant,
     mock_setup_entry: AsyncMock,
-    mock_config_flow_api: MagicMock,
+    mock_config_flow_api: FakeSession,
 ) -> None:
     """Test the user config flow step."""
     # Start the config flow
@@ -32,12 +41,8 @@ async def test_config_flow_user_step(
     # Submit the form with a valid host
     result = await hass.config_entries.flow.async_configure(
         result["flow_id"],
-        {
-            CONF_HOST: "192.168.1.100",
-            CONF_PASSWORD: "",
-        },
+        USER_STEP_VALID,
     )
-    await hass.async_block_till_done()
 
     # Should proceed to add_host step (to optionally add more hosts)
     assert result["type"] is FlowResultType.FORM
@@ -47,7 +52,7 @@ async def test_config_flow_user_step(
 async def test_config_flow_complete_single_host(
     hass: HomeAssistant,
     mock_setup_entry: AsyncMock,
-    mock_config_flow_api: MagicMock,
+    mock_config_flow_api: FakeSession,
 ) -> None:
     """Test completing the full config flow with a single host."""
     result = await hass.config_entries.flow.async_init(
@@ -57,22 +62,15 @@ async def test_config_flow_complete_single_host(
     # Submit user step
     result = await hass.config_entries.flow.async_configure(
         result["flow_id"],
-        {
-            CONF_HOST: "192.168.1.100",
-            CONF_PASSWORD: "",
-        },
+        USER_STEP_VALID,
     )
-    await hass.async_block_till_done()
 
     # At add_host step, don't add another host (empty string means skip)
     assert result["step_id"] == "add_host"
     result = await hass.config_entries.flow.async_configure(
         result["flow_id"],
-        {
-            CONF_HOST: "",  # Empty host means done adding
-        },
+        ADD_HOST_DONE,  # Empty host means done adding
     )
-    await hass.async_block_till_done()
 
     # Should now be at confirm step
     assert result["type"] is FlowResultType.FORM
@@ -99,28 +97,18 @@ async def test_config_flow_cannot_connect(
     with patch(
         "custom_components.homevolt_local.config_flow.async_get_clientsession"
     ) as mock_get_session:
-        mock_session = MagicMock()
+        # Mock connection failure
+        mock_session = FakeSession(get_response=FakeResponse(500))
         mock_get_session.return_value = mock_session
 
-        # Mock connection failure (response as async context manager)
-        mock_response = AsyncMock()
-        mock_response.status = 500
-        mock_response.__aenter__ = AsyncMock(return_value=mock_response)
-        mock_response.__aexit__ = AsyncMock(return_value=None)
-        mock_session.get = MagicMock(return_value=mock_response)
-
         result = await hass.config_entries.flow.async_init(
             DOMAIN, context={"source": config_entries.SOURCE_USER}
         )
 
         result = await hass.config_entries.flow.async_configure(
             result["flow_id"],
-            {
-                CONF_HOST: "192.168.1.100",
-                CONF_PASSWORD: "",
-            },
+            USER_STEP_VALID,
         )
-        await hass.async_block_till_done()
 
         assert result["type"] is FlowResultType.FORM
         assert result["errors"]["base"] == "cannot_connect"
@@ -134,28 +122,18 @@ async def test_config_flow_invalid_auth(
     with patch(
         "custom_components.homevolt_local.config_flow.async_get_clientsession"
     ) as mock_get_session:
-        mock_session = MagicMock()
+        # Mock 401 response
+        mock_session = FakeSession(get_response=FakeResponse(401))
         mock_get_session.return_value = mock_session
 
-        # Mock 401 response (as async context manager)
-        mock_response = AsyncMock()
-        mock_response.status = 401
-        mock_response.__aenter__ = AsyncMock(return_value=mock_response)
-        mock_response.__aexit__ = AsyncMock(return_value=None)
-        mock_session.get = MagicMock(return_value=mock_response)
-
         result = await hass.config_entries.flow.async_init(
             DOMAIN, context={"source": config_entries.SOURCE_USER}
         )
 
         result = await hass.config_entries.flow.async_configure(
             result["flow_id"],
-            {
-                CONF_HOST: "192.168.1.100",
-                CONF_PASSWORD: "wrong",
-            },
+            USER_STEP_BAD_AUTH,
         )
-        await hass.async_block_till_done()
 
         assert result["type"] is FlowResultType.FORM
         assert result["errors"]["base"] == "invalid_auth"
@@ -163,21 +141,20 @@ async def test_config_flow_invalid_auth(
 
 async def test_config_flow_invalid_host(
     hass: HomeAssistant,
-    mock_setup_entry: AsyncMock,
 ) -> None:
-    """Test config flow with invalid host format."""
+    """Test config flow with invalid host format.
+
+    Host validation rejects the input synchronously, so no entry is
+    created and neither the setup nor the HTTP mocks are needed.
+    """
     result = await hass.config_entries.flow.async_init(
         DOMAIN, context={"source": config_entries.SOURCE_USER}
     )
 
     result = await hass.config_entries.flow.async_configure(
         result["flow_id"],
-        {
-            CONF_HOST: "invalid host with spaces",
-            CONF_PASSWORD: "",
-        },
+        USER_STEP_INVALID_HOST,
     )
-    await hass.async_block_till_done()
 
     assert result["type"] is FlowResultType.FORM
     assert result["errors"]["base"] == "invalid_resource"
@@ -192,19 +169,14 @@ async def test_config_flow_auto_protocol_detection(
     with patch(
         "custom_components.homevolt_local.config_flow.async_get_clientsession"
     ) as mock_session_class:
-        mock_session = MagicMock()
+        mock_session = FakeSession()
         mock_session_class.return_value = mock_session
 
         # Mock successful response - validates protocol auto-detection
-        mock_response = AsyncMock()
-        mock_response.status = 200
-        mock_response.json = AsyncMock(return_value=mock_api_response)
+        mock_response = FakeResponse(200, json_data=mock_api_response)
 
         get_calls: list[str] = []
 
-        mock_response.__aenter__ = AsyncMock(return_value=mock_response)
-        mock_response.__aexit__ = AsyncMock(return_value=None)
-
         def mock_get_side_effect(url, *args, **kwargs):
             get_calls.append(url)
             return mock_response
@@ -218,10 +190,7 @@ async def test_config_flow_auto_protocol_detection(
         # Submit without protocol - should auto-detect
         result = await hass.config_entries.flow.async_configure(
             result["flow_id"],
-            {
-                CONF_HOST: "192.168.1.100",  # No protocol specified
-                CONF_PASSWORD: "",
-            },
+            USER_STEP_VALID,  # No protocol specified
         )
         await hass.async_block_till_done()
 
@@ -244,17 +213,11 @@ async def test_zeroconf_discovery_creates_entry(
     with patch(
         "custom_components.homevolt_local.config_flow.async_get_clientsession"
     ) as mock_session_class:
-        mock_session = MagicMock()
-        mock_session_class.return_value = mock_session
-
         # Mock successful response
-        mock_response = AsyncMock()
-        mock_response.status = 200
-        mock_response.json = AsyncMock(return_value=mock_api_response)
-
-        mock_response.__aenter__ = AsyncMock(return_value=mock_response)
-        mock_response.__aexit__ = AsyncMock(return_value=None)
-        mock_session.get = MagicMock(return_value=mock_response)
+        mock_session = FakeSession(
+            get_response=FakeResponse(200, json_data=mock_api_response)
+        )
+        mock_session_class.return_value = mock_session
 
         result = await hass.config_entries.flow.async_init(
             DOMAIN,
@@ -289,36 +252,17 @@ async def test_zeroconf_requires_auth_prompts_for_credentials(
     with patch(
         "custom_components.homevolt_local.config_flow.async_get_clientsession"
     ) as mock_session_class:
-        mock_session = MagicMock()
+        mock_session = FakeSession()
         mock_session_class.return_value = mock_session
 
         # Discovery goes straight to confirm form (no validation)
         # First call during confirm with credentials returns 401 (wrong creds)
-        mock_response_401 = AsyncMock()
-        mock_response_401.status = 401
-        mock_response_401.__aenter__ = AsyncMock(return_value=mock_response_401)
-        mock_response_401.__aexit__ = AsyncMock(return_value=None)
-
-        # Second call with correct credentials succeeds
-        mock_response_200 = AsyncMock()
-        mock_response_200.status = 200
-        mock_response_200.json = AsyncMock(return_value=mock_api_response)
-        mock_response_200.__aenter__ = AsyncMock(return_value=mock_response_200)
-        mock_response_200.__aexit__ = AsyncMock(return_value=None)
-
-        responses = [mock_response_401, mock_response_200]
-        call_count = [0]
-
-        def mock_get(*args, **kwargs):
-            resp = (
-                responses[call_count[0]]
-                if call_count[0] < len(responses)
-                else responses[-1]
-            )
-            call_count[0] += 1
-            return resp
-
-        mock_session.get = mock_get
+        # Second call with correct credentials succeeds; after the listed
+        # responses are exhausted, keep returning the successful one
+        ok_response = FakeResponse(200, json_data=mock_api_response)
+        responses = chain([FakeResponse(401)], repeat(ok_response))
+
+        mock_session.get = lambda *args, **kwargs: next(responses)
 
         result = await hass.config_entries.flow.async_init(
             DOMAIN,
@@ -423,16 +367,11 @@ async def test_zeroconf_extracts_mdns_id_from_hostname(
     with patch(
         "custom_components.homevolt_local.config_flow.async_get_clientsession"
     ) as mock_session_class:
-        mock_session = MagicMock()
+        mock_session = FakeSession(
+            get_response=FakeResponse(200, json_data=mock_api_response)
+        )
         mock_session_class.return_value = mock_session
 
-        mock_response = AsyncMock()
-        mock_response.status = 200
-        mock_response.json = AsyncMock(return_value=mock_api_response)
-        mock_response.__aenter__ = AsyncMock(return_value=mock_response)
-        mock_response.__aexit__ = AsyncMock(return_value=None)
-        mock_session.get = MagicMock(return_value=mock_response)
-
         result = await hass.config_entries.flow.async_init(
             DOMAIN,
             context={"source": config_entries.SOURCE_ZEROCONF},
@@ -2,51 +2,36 @@
 
 from __future__ import annotations
 
+from itertools import chain, repeat
 from typing import Any
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import MagicMock
 
+import pytest
 from homeassistant.core import HomeAssistant
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.homevolt_local.const import DOMAIN
-
-from .conftest import get_mock_api_response, setup_integration
-
-
-def create_aiohttp_session_mock(
-    get_response: dict[str, Any] | None = None,
-    post_response: str = "Schedule get: 0 schedules. Current ID: ''",
-    get_json_func: Any | None = None,
-) -> MagicMock:
-    """Create a mock for aiohttp ClientSession with async context managers."""
-    mock_session = MagicMock()
-
-    # Mock async GET response (as async context manager)
-    mock_get_response = AsyncMock()
-    mock_get_response.status = 200
-    if get_json_func:
-        mock_get_response.json = AsyncMock(side_effect=get_json_func)
-    else:
-        mock_get_response.json = AsyncMock(return_value=get_response or {})
-    mock_get_response.__aenter__ = AsyncMock(return_value=mock_get_response)
-    mock_get_response.__aexit__ = AsyncMock(return_value=None)
-    mock_session.get = MagicMock(return_value=mock_get_response)
-
-    # Mock async POST response (as async context manager)
-    mock_post_response = AsyncMock()
-    mock_post_response.status = 200
-    mock_post_response.text = AsyncMock(return_value=post_response)
-    mock_post_response.__aenter__ = AsyncMock(return_value=mock_post_response)
-    mock_post_response.__aexit__ = AsyncMock(return_value=None)
-    mock_session.post = MagicMock(return_value=mock_post_response)
-
-    return mock_session
-
-
+from custom_components.homevolt_local.coordinator import (
+    HomevoltDataUpdateCoordinator,
+)
+
+from .conftest import (
+    FakeResponse,
+    FakeSession,
+    create_aiohttp_session_mock,
+    get_mock_api_response,
+    make_multi_host_entry,
+    setup_integration,
+)
+
+
+@pytest.mark.parametrize(
+    "mocked_coordinator_api", [{"state": "idle", "power": 100.0}], indirect=True
+)
 async def test_coordinator_update(
     hass: HomeAssistant,
     mock_config_entry: MockConfigEntry,
-    mock_api_client: MagicMock,
+    mocked_coordinator_api: FakeSession,
 ) -> None:
     """Test that coordinator updates data correctly."""
     await setup_integration(hass, mock_config_entry)
@@ -54,75 +39,59 @@ async def test_coordinator_update(
     # Check that the coordinator has data
     coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]
     assert coordinator.data is not None
-    assert coordinator.data.aggregated.ems_data.state_str == "idle"
-    assert coordinator.data.aggregated.ems_data.power == 100.0
+
+    ems = coordinator.data.aggregated.ems_data
+    assert ems.state_str == "idle"
+    assert ems.power == 100.0
 
 
 async def test_coordinator_handles_api_changes(
     hass: HomeAssistant,
     mock_config_entry: MockConfigEntry,
+    monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     """Test that coordinator handles API response changes."""
     # Initial response
     initial_response = get_mock_api_response(state="idle", power=100.0)
     updated_response = get_mock_api_response(state="charging", power=500.0)
 
-    # Use a list to track which response to return
-    responses = [initial_response]
+    # First call returns the initial payload, every later call the update
+    payloads = chain([initial_response], repeat(updated_response))
 
-    def mock_json():
-        return responses[0]
+    mock_session = create_aiohttp_session_mock(get_json_func=lambda: next(payloads))
 
-    mock_session = create_aiohttp_session_mock(get_json_func=mock_json)
-
-    with patch(
+    monkeypatch.setattr(
         "custom_components.homevolt_local.coordinator.async_get_clientsession",
-        return_value=mock_session,
-    ):
-        # Setup integration
-        await setup_integration(hass, mock_config_entry)
+        lambda *args, **kwargs: mock_session,
+    )
 
-        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]
+    # Setup integration
+    await setup_integration(hass, mock_config_entry)
 
-        # Verify initial state
-        assert coordinator.data.aggregated.ems_data.state_str == "idle"
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]
 
-        # Update the response to return
-        responses[0] = updated_response
+    # Verify initial state
+    ems = coordinator.data.aggregated.ems_data
+    assert ems.state_str == "idle"
 
-        # Trigger a refresh
-        await coordinator.async_refresh()
-        await hass.async_block_till_done()
+    # Trigger a refresh; async_refresh awaits the update internally,
+    # so coordinator.data is already replaced when it returns
+    await coordinator.async_refresh()
 
-        # Verify updated state
-        assert coordinator.data.aggregated.ems_data.state_str == "charging"
-        assert coordinator.data.aggregated.ems_data.power == 500.0
+    # Verify updated state (data object was replaced, so re-bind)
+    ems = coordinator.data.aggregated.ems_data
+    assert ems.state_str == "charging"
+    assert ems.power == 500.0
 
 
 async def test_coordinator_multiple_hosts_data_merge(
     hass: HomeAssistant,
+    monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     """Test that coordinator merges data from multiple hosts."""
     # Create config entry with multiple hosts
-    multi_host_entry = MockConfigEntry(
-        domain=DOMAIN,
-        title="Homevolt",
-        data={
-            "main_host": "http://192.168.1.100",
-            "hosts": ["http://192.168.1.100", "http://192.168.1.101"],
-            "resources": [
-                "http://192.168.1.100/ems.json",
-                "http://192.168.1.101/ems.json",
-            ],
-            "username": "",
-            "password": "",
-            "verify_ssl": False,
-            "scan_interval": 30,
-            "timeout": 30,
-            "ecu_id": "test_ecu",
-        },
-        unique_id="multi_host_entry",
-        entry_id="multi_host_id",
+    multi_host_entry = make_multi_host_entry(
+        "multi_host_id", unique_id="multi_host_entry"
     )
 
     # Response for first host
@@ -143,205 +112,252 @@ async def test_coordinator_multiple_hosts_data_merge(
         }
     ]
 
-    call_count = [0]
-
-    def mock_json():
-        call_count[0] += 1
-        # First call returns response1, second returns response2
-        return response1 if call_count[0] == 1 else response2
-
-    mock_session = create_aiohttp_session_mock(get_json_func=mock_json)
+    # Each host gets its own response, in resource order
+    mock_session = create_aiohttp_session_mock()
+    mock_session.get = MagicMock(
+        side_effect=[
+            FakeResponse(200, json_data=response1),
+            FakeResponse(200, json_data=response2),
+        ]
+    )
 
-    with patch(
+    monkeypatch.setattr(
         "custom_components.homevolt_local.coordinator.async_get_clientsession",
-        return_value=mock_session,
-    ):
-        await setup_integration(hass, multi_host_entry)
+        lambda *args, **kwargs: mock_session,
+    )
 
-        coordinator = hass.data[DOMAIN][multi_host_entry.entry_id]
+    await setup_integration(hass, multi_host_entry)
 
-        # Verify data was merged - should have data from both hosts
-        assert coordinator.data is not None
+    coordinator = hass.data[DOMAIN][multi_host_entry.entry_id]
+
+    # Verify data was merged - should have data from both hosts
+    assert coordinator.data is not None
 
 
-async def test_coordinator_sensor_deduplication_null_euid_different_types(
+NULL_EUID = "0000000000000000"
+REAL_EUID = "a46dd4fffea29595"
+
+
+@pytest.mark.parametrize(
+    ("sensors1", "sensors2", "expected_count", "expected_types"),
+    [
+        pytest.param(
+            # Host 1: load sensor with null EUID
+            [
+                {
+                    "euid": NULL_EUID,
+                    "type": "load",
+                    "total_power": 100.0,
+                    "energy_imported": 1000.0,
+                    "energy_exported": 0.0,
+                    "available": True,
+                    "node_id": 0,
+                },
+            ],
+            # Host 2: grid and solar sensors with the same null EUID
+            [
+                {
+                    "euid": NULL_EUID,
+                    "type": "grid",
+                    "total_power": 200.0,
+                    "energy_imported": 2000.0,
+                    "energy_exported": 500.0,
+                    "available": True,
+                    "node_id": 1,
+                },
+                {
+                    "euid": NULL_EUID,
+                    "type": "solar",
+                    "total_power": 300.0,
+                    "energy_imported": 0.0,
+                    "energy_exported": 3000.0,
+                    "available": True,
+                    "node_id": 2,
+                },
+            ],
+            3,
+            {"load", "grid", "solar"},
+            id="null_euid_different_types_kept",
+        ),
+        pytest.param(
+            # Both hosts report the SAME solar sensor (same euid, same type)
+            [
+                {
+                    "euid": REAL_EUID,
+                    "type": "solar",
+                    "total_power": 100.0,
+                    "energy_imported": 0.0,
+                    "energy_exported": 1000.0,
+                    "available": True,
+                    "node_id": 0,
+                },
+            ],
+            [
+                {
+                    "euid": REAL_EUID,
+                    "type": "solar",
+                    "total_power": 100.0,
+                    "energy_imported": 0.0,
+                    "energy_exported": 1000.0,
+                    "available": True,
+                    "node_id": 0,
+                },
+            ],
+            1,
+            {"solar"},
+            id="same_euid_same_type_deduplicated",
+        ),
+    ],
+)
+async def test_coordinator_sensor_deduplication(
     hass: HomeAssistant,
+    monkeypatch: pytest.MonkeyPatch,
+    sensors1: list[dict[str, Any]],
+    sensors2: list[dict[str, Any]],
+    expected_count: int,
+    expected_types: set[str],
 ) -> None:
-    """Test that sensors with null EUID but different types are NOT deduplicated.
+    """Test sensor deduplication across hosts.
 
     Virtual sensors (load, grid, solar) may share the same null EUID
-    ("0000000000000000") but should be treated as distinct sensors.
+    ("0000000000000000") but must be kept as distinct sensors, while the
+    same physical sensor reported from multiple hosts (same euid AND
+    same type) must only appear once in the merged data.
     """
-    from custom_components.homevolt_local.coordinator import (
-        HomevoltDataUpdateCoordinator,
-    )
+    config_entry = make_multi_host_entry("dedup_test_id", unique_id="dedup_test_entry")
 
-    # Create config entry
-    config_entry = MockConfigEntry(
-        domain=DOMAIN,
-        title="Homevolt",
-        data={
-            "main_host": "http://192.168.1.100",
-            "hosts": ["http://192.168.1.100", "http://192.168.1.101"],
-            "resources": [
-                "http://192.168.1.100/ems.json",
-                "http://192.168.1.101/ems.json",
-            ],
-            "username": "",
-            "password": "",
-            "verify_ssl": False,
-            "scan_interval": 30,
-            "timeout": 30,
-            "ecu_id": "test_ecu",
-        },
-        unique_id="dedup_test_entry",
-        entry_id="dedup_test_id",
-    )
-
-    null_euid = "0000000000000000"
-
-    # Response from host 1: has load sensor with null EUID
     response1: dict[str, Any] = get_mock_api_response(ecu_id="ecu_1")
-    response1["sensors"] = [
-        {
-            "euid": null_euid,
-            "type": "load",
-            "total_power": 100.0,
-            "energy_imported": 1000.0,
-            "energy_exported": 0.0,
-            "available": True,
-            "node_id": 0,
-        },
-    ]
+    response1["sensors"] = sensors1
 
-    # Response from host 2: has grid and solar sensors with same null EUID
     response2: dict[str, Any] = get_mock_api_response(ecu_id="ecu_1")
-    response2["sensors"] = [
-        {
-            "euid": null_euid,
-            "type": "grid",
-            "total_power": 200.0,
-            "energy_imported": 2000.0,
-            "energy_exported": 500.0,
-            "available": True,
-            "node_id": 1,
-        },
-        {
-            "euid": null_euid,
-            "type": "solar",
-            "total_power": 300.0,
-            "energy_imported": 0.0,
-            "energy_exported": 3000.0,
-            "available": True,
-            "node_id": 2,
-        },
-    ]
-
-    call_count = [0]
+    response2["sensors"] = sensors2
+
+    # Each host gets its own response, in resource order
+    mock_session = create_aiohttp_session_mock()
+    mock_session.get = MagicMock(
+        side_effect=[
+            FakeResponse(200, json_data=response1),
+            FakeResponse(200, json_data=response2),
+        ]
+    )
 
-    def mock_json():
-        call_count[0] += 1
-        return response1 if call_count[0] == 1 else response2
+    monkeypatch.setattr(
+        "custom_components.homevolt_local.coordinator.async_get_clientsession",
+        lambda *args, **kwargs: mock_session,
+    )
 
-    mock_session = create_aiohttp_session_mock(get_json_func=mock_json)
+    await setup_integration(hass, config_entry)
 
-    with patch(
-        "custom_components.homevolt_local.coordinator.async_get_clientsession",
-        return_value=mock_session,
-    ):
-        await setup_integration(hass, config_entry)
+    coordinator: HomevoltDataUpdateCoordinator = hass.data[DOMAIN][
+        config_entry.entry_id
+    ]
 
-        coordinator: HomevoltDataUpdateCoordinator = hass.data[DOMAIN][
-            config_entry.entry_id
-        ]
+    assert coordinator.data is not None
+    assert len(coordinator.data.sensors) == expected_count
+    assert {s.type for s in coordinator.data.sensors} == expected_types
 
-        # All three sensors should be present (not deduplicated)
-        assert coordinator.data is not None
-        assert len(coordinator.data.sensors) == 3
 
-        # Verify each sensor type is present
-        sensor_types = {s.type for s in coordinator.data.sensors}
-        assert "load" in sensor_types
-        assert "grid" in sensor_types
-        assert "solar" in sensor_types
+MAIN_RESOURCE = "http://192.168.1.100/ems.json"
+SECONDARY_RESOURCE = "http://192.168.1.101/ems.json"
 
 
-async def test_coordinator_sensor_deduplication_same_euid_same_type(
+async def test_coordinator_prefer_main_host_polls_main_only(
     hass: HomeAssistant,
+    monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    """Test that sensors with same EUID AND same type ARE deduplicated.
+    """Test that prefer_main_host polls only the main host between probes.
 
-    When the same physical sensor is reported from multiple hosts,
-    it should only appear once in the merged data.
+    The first refresh and every SECONDARY_PROBE_INTERVAL-th cycle fan
+    out to all hosts; the cycles in between request only the main host's
+    resource while keeping the secondary devices from the last probe.
     """
-    config_entry = MockConfigEntry(
-        domain=DOMAIN,
-        title="Homevolt",
-        data={
-            "main_host": "http://192.168.1.100",
-            "hosts": ["http://192.168.1.100", "http://192.168.1.101"],
-            "resources": [
-                "http://192.168.1.100/ems.json",
-                "http://192.168.1.101/ems.json",
-            ],
-            "username": "",
-            "password": "",
-            "verify_ssl": False,
-            "scan_interval": 30,
-            "timeout": 30,
-            "ecu_id": "test_ecu",
-        },
-        unique_id="dedup_same_test",
-        entry_id="dedup_same_id",
+    config_entry = make_multi_host_entry(
+        "prefer_main_id", unique_id="prefer_main_entry", prefer_main_host=True
     )
 
-    real_euid = "a46dd4fffea29595"
+    requested_urls: list[str] = []
+    responses = {
+        MAIN_RESOURCE: get_mock_api_response(ecu_id="ecu_main"),
+        SECONDARY_RESOURCE: get_mock_api_response(ecu_id="ecu_side"),
+    }
 
-    # Both hosts report the SAME solar sensor (same euid, same type)
-    response1: dict[str, Any] = get_mock_api_response(ecu_id="ecu_1")
-    response1["sensors"] = [
-        {
-            "euid": real_euid,
-            "type": "solar",
-            "total_power": 100.0,
-            "energy_imported": 0.0,
-            "energy_exported": 1000.0,
-            "available": True,
-            "node_id": 0,
-        },
-    ]
+    def fake_get(url: str, **kwargs: Any) -> FakeResponse:
+        requested_urls.append(url)
+        return FakeResponse(200, json_data=responses[url])
 
-    response2: dict[str, Any] = get_mock_api_response(ecu_id="ecu_1")
-    response2["sensors"] = [
-        {
-            "euid": real_euid,  # Same euid
-            "type": "solar",  # Same type
-            "total_power": 100.0,
-            "energy_imported": 0.0,
-            "energy_exported": 1000.0,
-            "available": True,
-            "node_id": 0,
-        },
-    ]
+    mock_session = create_aiohttp_session_mock()
+    mock_session.get = fake_get
+
+    monkeypatch.setattr(
+        "custom_components.homevolt_local.coordinator.async_get_clientsession",
+        lambda *args, **kwargs: mock_session,
+    )
 
-    call_count = [0]
+    await setup_integration(hass, config_entry)
+
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    assert coordinator.data is not None
+
+    # The first refresh (update 1) fans out so the secondary hosts'
+    # devices exist from the start
+    assert SECONDARY_RESOURCE in requested_urls
+    assert {ems.ecu_id for ems in coordinator.data.ems} == {"ecu_main", "ecu_side"}
+
+    # Updates 2..9 poll only the main host but keep the secondary's
+    # devices from the last probe
+    requested_urls.clear()
+    for _ in range(8):
+        await coordinator.async_refresh()
+    assert SECONDARY_RESOURCE not in requested_urls
+    assert {ems.ecu_id for ems in coordinator.data.ems} == {"ecu_main", "ecu_side"}
 
-    def mock_json():
-        call_count[0] += 1
-        return response1 if call_count[0] == 1 else response2
+    # Update 10 is a probe cycle: the fan-out hits every host again
+    await coordinator.async_refresh()
+    assert SECONDARY_RESOURCE in requested_urls
 
-    mock_session = create_aiohttp_session_mock(get_json_func=mock_json)
 
-    with patch(
+async def test_coordinator_prefer_main_host_falls_back_on_failure(
+    hass: HomeAssistant,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test that a failing main host falls back to polling all hosts."""
+    config_entry = make_multi_host_entry(
+        "prefer_fallback_id",
+        unique_id="prefer_fallback_entry",
+        prefer_main_host=True,
+    )
+
+    requested_urls: list[str] = []
+    api_response = get_mock_api_response(ecu_id="ecu_2")
+
+    def fake_get(url: str, **kwargs: Any) -> FakeResponse:
+        requested_urls.append(url)
+        if url == MAIN_RESOURCE:
+            return FakeResponse(500)
+        return FakeResponse(200, json_data=api_response)
+
+    mock_session = create_aiohttp_session_mock()
+    mock_session.get = fake_get
+
+    monkeypatch.setattr(
         "custom_components.homevolt_local.coordinator.async_get_clientsession",
-        return_value=mock_session,
-    ):
-        await setup_integration(hass, config_entry)
+        lambda *args, **kwargs: mock_session,
+    )
 
-        coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    await setup_integration(hass, config_entry)
 
-        # Should only have ONE sensor (deduplicated)
-        assert coordinator.data is not None
-        assert len(coordinator.data.sensors) == 1
-        assert coordinator.data.sensors[0].euid == real_euid
-        assert coordinator.data.sensors[0].type == "solar"
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+
+    # The first refresh always fans out; the secondary host's data is
+    # used since the main host failed
+    assert coordinator.data is not None
+    assert requested_urls.count(MAIN_RESOURCE) == 1
+    assert requested_urls.count(SECONDARY_RESOURCE) == 1
+
+    # The next cycle tries the main-only fast path, fails, and falls
+    # back to the full fan-out
+    await coordinator.async_refresh()
+    assert "falling back to all hosts" in caplog.text
+    assert requested_urls.count(MAIN_RESOURCE) == 3  # fast path + fan-out
+    assert requested_urls.count(SECONDARY_RESOURCE) == 2
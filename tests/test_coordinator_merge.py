@@ -5,7 +5,6 @@ from __future__ import annotations
 import logging
 from datetime import timedelta
 from typing import Any
-from unittest.mock import patch
 
 import pytest
 from homeassistant.core import HomeAssistant
@@ -61,9 +60,15 @@ def get_mock_response(
     }
 
 
+async def mock_schedule() -> dict[str, Any]:
+    """Stand-in for _fetch_schedule_data returning no schedules."""
+    return {}
+
+
 async def test_single_host_no_duplicates(
     hass: HomeAssistant,
     caplog: pytest.LogCaptureFixture,
+    monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     """Test single host setup doesn't create duplicates."""
     caplog.set_level(logging.DEBUG)
@@ -84,11 +89,14 @@ async def test_single_host_no_duplicates(
 
     # Mock the fetch to return data
     mock_response = get_mock_response()
-    with (
-        patch.object(coordinator, "_fetch_resource_data", return_value=mock_response),
-        patch.object(coordinator, "_fetch_schedule_data", return_value={}),
-    ):
-        data = await coordinator._async_update_data()
+
+    async def mock_fetch(resource: str) -> dict[str, Any]:
+        return mock_response
+
+    monkeypatch.setattr(coordinator, "_fetch_resource_data", mock_fetch)
+    monkeypatch.setattr(coordinator, "_fetch_schedule_data", mock_schedule)
+
+    data = await coordinator._async_update_data()
 
     # Verify no duplicates
     assert len(data.sensors) == 3
@@ -102,6 +110,7 @@ async def test_single_host_no_duplicates(
 async def test_multi_host_main_timeout_causes_duplicates(
     hass: HomeAssistant,
     caplog: pytest.LogCaptureFixture,
+    monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     """Test that main host timeout with fallback used to cause duplicates (now fixed)."""
     caplog.set_level(logging.DEBUG)
@@ -133,9 +142,10 @@ async def test_multi_host_main_timeout_causes_duplicates(
             raise UpdateFailed("Timeout")
         return secondary_response
 
-    with patch.object(coordinator, "_fetch_resource_data", side_effect=mock_fetch):
-        with patch.object(coordinator, "_fetch_schedule_data", return_value={}):
-            data = await coordinator._async_update_data()
+    monkeypatch.setattr(coordinator, "_fetch_resource_data", mock_fetch)
+    monkeypatch.setattr(coordinator, "_fetch_schedule_data", mock_schedule)
+
+    data = await coordinator._async_update_data()
 
     # With the fix, secondary host data should be used once, not duplicated
     # Check that we have the expected counts
@@ -150,6 +160,7 @@ async def test_multi_host_main_timeout_causes_duplicates(
 async def test_multi_host_both_respond_deduplication(
     hass: HomeAssistant,
     caplog: pytest.LogCaptureFixture,
+    monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     """Test that sensors from both hosts are deduplicated correctly."""
     caplog.set_level(logging.DEBUG)
@@ -180,9 +191,10 @@ async def test_multi_host_both_respond_deduplication(
             return main_response
         return secondary_response
 
-    with patch.object(coordinator, "_fetch_resource_data", side_effect=mock_fetch):
-        with patch.object(coordinator, "_fetch_schedule_data", return_value={}):
-            data = await coordinator._async_update_data()
+    monkeypatch.setattr(coordinator, "_fetch_resource_data", mock_fetch)
+    monkeypatch.setattr(coordinator, "_fetch_schedule_data", mock_schedule)
+
+    data = await coordinator._async_update_data()
 
     # Sensors should be deduplicated (same euid+type from both hosts)
     assert len(data.sensors) == 3, f"Expected 3 sensors, got {len(data.sensors)}"
@@ -196,6 +208,7 @@ async def test_multi_host_both_respond_deduplication(
 async def test_api_returns_duplicate_sensors(
     hass: HomeAssistant,
     caplog: pytest.LogCaptureFixture,
+    monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     """Test handling when API itself returns duplicate sensors."""
     caplog.set_level(logging.DEBUG)
@@ -226,11 +239,13 @@ async def test_api_returns_duplicate_sensors(
     ]
     mock_response = get_mock_response(sensors=duplicate_sensors)
 
-    with (
-        patch.object(coordinator, "_fetch_resource_data", return_value=mock_response),
-        patch.object(coordinator, "_fetch_schedule_data", return_value={}),
-    ):
-        data = await coordinator._async_update_data()
+    async def mock_fetch(resource: str) -> dict[str, Any]:
+        return mock_response
+
+    monkeypatch.setattr(coordinator, "_fetch_resource_data", mock_fetch)
+    monkeypatch.setattr(coordinator, "_fetch_schedule_data", mock_schedule)
+
+    data = await coordinator._async_update_data()
 
     # Duplicates from the API are now deduplicated by the coordinator.
     # This was fixed because duplicate sensors could cause issues for users.
@@ -2,111 +2,100 @@
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock
-
+import pytest
 from homeassistant.const import UnitOfEnergy
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import entity_registry as er
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 from syrupy.assertion import SnapshotAssertion
 
-from .conftest import setup_integration
+from custom_components.homevolt_local.const import DOMAIN
 
+from .conftest import (
+    create_aiohttp_session_mock,
+    get_mock_api_response,
+    setup_integration,
+)
 
-async def test_sensor_entities_created(
-    hass: HomeAssistant,
-    mock_config_entry: MockConfigEntry,
-    mock_api_client: MagicMock,
-) -> None:
-    """Test sensor entities are created correctly."""
-    await setup_integration(hass, mock_config_entry)
+# Every test needs the API mock active but none reads it, so request it
+# here instead of binding an unused argument in each signature
+pytestmark = pytest.mark.usefixtures("mock_api_client")
 
-    # Check that sensors are created via state machine
-    # Entity IDs now use device name + entity name pattern (e.g., sensor.system_status)
-    state = hass.states.get("sensor.system_status")
-    assert state is not None
-    # State may be "unknown" if coordinator doesn't have data
-    # but entity should exist
+# (entity_id, device_class, unit_of_measurement) for every sensor the
+# integration must create; None where the entity does not set the
+# attribute. Built once at import time rather than per test run.
+EXPECTED_SENSORS: tuple[tuple[str, str | None, str | None], ...] = (
+    ("sensor.system_status", None, None),
+    ("sensor.system_power", "power", "W"),
+    # Entity name is derived from device_class BATTERY -> "Battery"
+    ("sensor.system_battery", "battery", "%"),
+    (
+        "sensor.system_energy_exported",
+        "energy",
+        UnitOfEnergy.KILO_WATT_HOUR,
+    ),
+    ("sensor.system_current_schedule", None, None),
+)
+
+# Unique IDs the integration must always register for the main device
+EXPECTED_UNIQUE_IDS = frozenset(
+    {
+        "homevolt_local_ems_test_ecu_123",
+        "homevolt_local_power_test_ecu_123",
+    }
+)
 
 
-async def test_sensor_power_entity_exists(
+async def test_sensor_entities_created(
     hass: HomeAssistant,
     mock_config_entry: MockConfigEntry,
-    mock_api_client: MagicMock,
 ) -> None:
-    """Test power sensor entity exists."""
-    await setup_integration(hass, mock_config_entry)
-
-    state = hass.states.get("sensor.system_power")
-    assert state is not None
-    assert state.attributes.get("device_class") == "power"
-    assert state.attributes.get("unit_of_measurement") == "W"
-
+    """Test the expected sensor entities exist with class and unit.
 
-async def test_sensor_soc_entity_exists(
-    hass: HomeAssistant,
-    mock_config_entry: MockConfigEntry,
-    mock_api_client: MagicMock,
-) -> None:
-    """Test state of charge sensor entity exists."""
+    One setup covers all entities; booting hass and running the first
+    coordinator refresh per entity would dominate the module's runtime.
+    """
     await setup_integration(hass, mock_config_entry)
 
-    # Entity name is derived from device_class BATTERY -> "Battery"
-    state = hass.states.get("sensor.system_battery")
-    assert state is not None
-    assert state.attributes.get("device_class") == "battery"
-    assert state.attributes.get("unit_of_measurement") == "%"
-
-
-async def test_sensor_energy_exported_entity_exists(
-    hass: HomeAssistant,
-    mock_config_entry: MockConfigEntry,
-    mock_api_client: MagicMock,
-) -> None:
-    """Test energy exported sensor entity exists."""
-    await setup_integration(hass, mock_config_entry)
+    # Index the sensor states once; each assertion is then a plain dict
+    # lookup instead of a hass.states.get round-trip
+    sensor_states = {
+        state.entity_id: state for state in hass.states.async_all("sensor")
+    }
 
-    state = hass.states.get("sensor.system_energy_exported")
-    assert state is not None
-    assert state.attributes.get("device_class") == "energy"
-    assert state.attributes.get("unit_of_measurement") == UnitOfEnergy.KILO_WATT_HOUR
+    for entity_id, device_class, unit in EXPECTED_SENSORS:
+        state = sensor_states.get(entity_id)
+        assert state is not None, f"{entity_id} should exist"
+        attrs = state.attributes
+        if device_class is not None:
+            assert attrs.get("device_class") == device_class
+        if unit is not None:
+            assert attrs.get("unit_of_measurement") == unit
 
 
 async def test_sensor_entity_registry(
     hass: HomeAssistant,
     mock_config_entry: MockConfigEntry,
-    mock_api_client: MagicMock,
     entity_registry: er.EntityRegistry,
 ) -> None:
     """Test sensors are registered in entity registry."""
     await setup_integration(hass, mock_config_entry)
 
-    # Check that main sensors are in the registry
-    entry = entity_registry.async_get("sensor.system_status")
-    assert entry is not None
-    assert entry.unique_id == "homevolt_local_ems_test_ecu_123"
-
-    entry = entity_registry.async_get("sensor.system_power")
-    assert entry is not None
-    assert entry.unique_id == "homevolt_local_power_test_ecu_123"
-
-
-async def test_schedule_sensor_exists(
-    hass: HomeAssistant,
-    mock_config_entry: MockConfigEntry,
-    mock_api_client: MagicMock,
-) -> None:
-    """Test schedule sensor entity exists."""
-    await setup_integration(hass, mock_config_entry)
-
-    state = hass.states.get("sensor.system_current_schedule")
-    assert state is not None
+    # Check that the main sensors are in the registry with one set
+    # difference instead of a lookup-and-compare per unique id
+    registered_ids = {
+        entry.unique_id
+        for entry in er.async_entries_for_config_entry(
+            entity_registry, mock_config_entry.entry_id
+        )
+    }
+    missing = EXPECTED_UNIQUE_IDS - registered_ids
+    assert not missing, f"Missing unique_ids in registry: {missing}"
 
 
 async def test_sensor_states_snapshot(
     hass: HomeAssistant,
     mock_config_entry: MockConfigEntry,
-    mock_api_client: MagicMock,
     entity_registry: er.EntityRegistry,
     snapshot: SnapshotAssertion,
 ) -> None:
@@ -114,18 +103,64 @@ async def test_sensor_states_snapshot(
     await setup_integration(hass, mock_config_entry)
 
     # Get all entity IDs for this integration
-    entries = er.async_entries_for_config_entry(
-        entity_registry, mock_config_entry.entry_id
+    registered = {
+        entry.entity_id
+        for entry in er.async_entries_for_config_entry(
+            entity_registry, mock_config_entry.entry_id
+        )
+    }
+
+    # One pass over the sensor states instead of a get() per entity
+    states = {
+        state.entity_id: {
+            "state": state.state,
+            "attributes": dict(state.attributes),
+        }
+        for state in hass.states.async_all("sensor")
+        if state.entity_id in registered
+    }
+
+    assert states == snapshot
+
+
+async def test_sensor_attributes_survive_refresh(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    monkeypatch: pytest.MonkeyPatch,
+    mock_schedule_response: str,
+) -> None:
+    """Test data attributes survive a post-setup coordinator refresh.
+
+    The models are slotted dataclasses without __dict__, so the attrs_fn
+    lambdas must build their dicts from dataclass fields; a regression
+    there is swallowed by the broad except in _handle_coordinator_update
+    and only shows up as silently missing attributes.
+    """
+    mock_session = create_aiohttp_session_mock(
+        get_response=get_mock_api_response(),
+        post_response=mock_schedule_response,
+    )
+    monkeypatch.setattr(
+        "custom_components.homevolt_local.coordinator.async_get_clientsession",
+        lambda *args, **kwargs: mock_session,
     )
 
-    # Create a dict of entity_id -> state for snapshot comparison
-    states = {}
-    for entry in entries:
-        state = hass.states.get(entry.entity_id)
-        if state:
-            states[entry.entity_id] = {
-                "state": state.state,
-                "attributes": dict(state.attributes),
-            }
+    await setup_integration(hass, mock_config_entry)
 
-    assert states == snapshot
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.system_status")
+    assert state is not None
+    assert state.state == "idle"
+    attrs = state.attributes
+    assert attrs["ems"], "ems devices should be exposed as attributes"
+    assert attrs["aggregated"], "aggregated data should be exposed"
+    assert attrs["sensors"], "sensor list should be exposed"
+
+    schedule_state = hass.states.get("sensor.system_current_schedule")
+    assert schedule_state is not None
+    schedule_attrs = schedule_state.attributes
+    assert schedule_attrs["schedule_count"] == 2
+    assert len(schedule_attrs["schedules"]) == 2